@@ -52,6 +52,25 @@ export interface DiscoveryResult {
 // Cache key for AsyncStorage
 const CACHE_KEY = '@greengrass-server';
 
+// Port serving GET /services when the TXT record doesn't advertise one
+// (the sentiment service; the API gateway on 8000 is not deployed yet)
+const DEFAULT_SERVICES_PORT = 8001;
+
+/**
+ * Pick the address to connect to, preferring IPv4 (the advertiser also
+ * publishes an IPv6 address, and resolvers may list it first).
+ */
+function pickAddress(addresses: string[] | undefined): string | undefined {
+  return addresses?.find((address) => !address.includes(':')) || addresses?.[0];
+}
+
+/**
+ * Format an IP address for use in a URL (IPv6 literals must be bracketed).
+ */
+export function formatUrlHost(ip: string): string {
+  return ip.includes(':') && !ip.startsWith('[') ? `[${ip}]` : ip;
+}
+
 /**
  * Discover Greengrass server on local network using native mDNS.
  *
@@ -67,7 +86,7 @@ const CACHE_KEY = '@greengrass-server';
  *   console.log(`IP: ${result.server.ip}, latency: ${result.latency}ms`);
  *
  *   // Connect to server
- *   const apiUrl = `${result.server.protocol}://${result.server.ip}:${result.server.port}`;
+ *   const apiUrl = `${result.server.protocol}://${formatUrlHost(result.server.ip)}:${result.server.port}`;
  *   const response = await fetch(`${apiUrl}/api/sentiment`, {
  *     method: 'POST',
  *     body: JSON.stringify({ text: 'Great service!' }),
@@ -139,18 +158,25 @@ export async function discoverGreengrassServer(
           clearTimeout(timeoutId);
           zeroconf.stop();
 
+          const ip = pickAddress(service.addresses) || service.host;
+
+          // TXT record only carries v/api (plus the /services port);
+          // the rest of the metadata is fetched once over HTTP
+          const servicesPort = Number(service.txt?.svc_port) || DEFAULT_SERVICES_PORT;
+          const details = await fetchServiceDetails(ip, servicesPort);
+
           const server: GreengrassServer = {
             hostname: service.host || 'greengrass.local',
-            ip: service.addresses?.[0] || service.host,
+            ip,
             port: service.port || 8000,
             protocol: 'http',
             properties: {
-              version: service.txt?.version,
-              api: service.txt?.api,
-              endpoints: service.txt?.endpoints,
-              manufacturer: service.txt?.manufacturer,
-              model: service.txt?.model,
-              security: service.txt?.security,
+              version: details?.version || service.txt?.v,
+              api: details?.api || service.txt?.api,
+              endpoints: details?.endpoints?.join(','),
+              manufacturer: details?.manufacturer,
+              model: details?.model,
+              security: details?.security,
             },
           };
 
@@ -200,6 +226,38 @@ export async function discoverGreengrassServer(
   });
 }
 
+/**
+ * Fetch service metadata from GET /services (endpoints are not in the TXT record).
+ */
+async function fetchServiceDetails(
+  ip: string,
+  port: number,
+  timeout: number = 2000
+): Promise<{
+  version?: string;
+  api?: string;
+  endpoints?: string[];
+  manufacturer?: string;
+  model?: string;
+  security?: string;
+} | null> {
+  try {
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), timeout);
+
+    const response = await fetch(`http://${formatUrlHost(ip)}:${port}/services`, {
+      method: 'GET',
+      signal: controller.signal,
+    });
+
+    clearTimeout(timeoutId);
+    return response.ok ? await response.json() : null;
+  } catch (error) {
+    console.warn('Failed to fetch Greengrass service details:', error);
+    return null;
+  }
+}
+
 /**
  * Check if a server is reachable.
  */
@@ -212,7 +270,7 @@ async function isServerReachable(
     const controller = new AbortController();
     const timeoutId = setTimeout(() => controller.abort(), timeout);
 
-    const response = await fetch(`http://${ip}:${port}/health`, {
+    const response = await fetch(`http://${formatUrlHost(ip)}:${port}/health`, {
       method: 'GET',
       signal: controller.signal,
     });
@@ -325,7 +383,7 @@ export async function getGreengrassUrl(): Promise<string> {
   }
 
   // Use IP address instead of hostname for React Native
-  return `${result.server.protocol}://${result.server.ip}:${result.server.port}`;
+  return `${result.server.protocol}://${formatUrlHost(result.server.ip)}:${result.server.port}`;
 }
 
 /**
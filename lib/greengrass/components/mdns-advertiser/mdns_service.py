@@ -13,11 +13,17 @@ This allows staff web/mobile apps to discover the Greengrass server without
 needing manual IP configuration.
 """
 
+import asyncio
+import fcntl
+import ipaddress
 import logging
+import os
+import signal
 import socket
-import time
-from zeroconf import ServiceInfo, Zeroconf
-from typing import Dict
+import struct
+from zeroconf import IPVersion
+from zeroconf.asyncio import AsyncServiceInfo, AsyncZeroconf
+from typing import Dict, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +32,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ioctl request to read an interface's IPv4 address (linux/sockios.h)
+SIOCGIFADDR = 0x8915
+
+# Property network interfaces to try first, and virtual interfaces to skip
+PREFERRED_INTERFACES = ("eth0", "wlan0")
+IGNORED_INTERFACE_PREFIXES = ("lo", "docker", "veth", "br-", "virbr")
+
+# Kernel IPv6 address table, and address flags that make an address unusable
+# (IFA_F_DADFAILED | IFA_F_DEPRECATED | IFA_F_TENTATIVE)
+IF_INET6_PATH = "/proc/net/if_inet6"
+IFA_F_UNUSABLE = 0x08 | 0x20 | 0x40
+
+
+def get_interface_ip(sock: socket.socket, interface: str) -> Optional[str]:
+    """
+    Read the IPv4 address assigned to a network interface.
+
+    Returns:
+        Optional[str]: IPv4 address, or None if the interface has none
+    """
+    try:
+        request = struct.pack("256s", interface[:15].encode())
+        response = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)
+        return socket.inet_ntoa(response[20:24])
+    except OSError:
+        return None
+
+
+def get_local_interface() -> Tuple[Optional[str], str]:
+    """
+    Get the network interface and IPv4 address to advertise.
+
+    Resolution order:
+    1. GREENGRASS_BIND_IP environment variable
+    2. First non-loopback IPv4 address from the interface table (eth0/wlan0 first)
+    3. 127.0.0.1
+
+    Reads the interface table directly, so it works on air-gapped property
+    networks (no route to the internet required).
+
+    Returns:
+        Tuple[Optional[str], str]: (interface name or None if unknown, IPv4 address)
+    """
+    bind_ip = os.getenv("GREENGRASS_BIND_IP")
+
+    try:
+        interfaces = [name for _, name in socket.if_nameindex()]
+    except OSError as e:
+        logger.error(f"Failed to list network interfaces: {e}")
+        interfaces = []
+
+    candidates = [name for name in PREFERRED_INTERFACES if name in interfaces] + [
+        name for name in interfaces
+        if name not in PREFERRED_INTERFACES and not name.startswith(IGNORED_INTERFACE_PREFIXES)
+    ]
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        if bind_ip:
+            # Find the interface carrying the configured IP (for its IPv6 address)
+            interface = next((name for name in interfaces if get_interface_ip(sock, name) == bind_ip), None)
+            return interface, bind_ip
+
+        for interface in candidates:
+            ip = get_interface_ip(sock, interface)
+            if ip and not ip.startswith("127."):
+                return interface, ip
+
+    logger.error("Failed to get local IP: no interface with an IPv4 address")
+    return None, "127.0.0.1"
+
 
 def get_local_ip() -> str:
     """
@@ -34,127 +110,155 @@ def get_local_ip() -> str:
     Returns:
         str: Local IP address (e.g., "192.168.20.10")
     """
+    return get_local_interface()[1]
+
+
+def get_local_ipv6(interface: Optional[str]) -> Optional[str]:
+    """
+    Get a routable IPv6 address of a network interface, if it has one.
+
+    Reads the kernel address table (no resolver lookups, so it can't stall on
+    DNS on air-gapped networks). Loopback and link-local addresses are skipped
+    (link-local needs a scope id that mDNS clients can't use), as are
+    tentative, deprecated and DAD-failed addresses.
+
+    Returns:
+        Optional[str]: IPv6 address (e.g., "fd00:20::10"), or None
+    """
+    if not interface:
+        return None
+
     try:
-        # Create a socket and connect to a remote host (doesn't actually send data)
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))  # Google DNS
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
-    except Exception as e:
-        logger.error(f"Failed to get local IP: {e}")
-        return "127.0.0.1"
+        with open(IF_INET6_PATH) as f:
+            entries = [line.split() for line in f]
+    except OSError:
+        return None
 
+    # Each line: address(hex) ifindex prefix_len scope flags interface
+    for address_hex, _, _, _, flags, name in (entry for entry in entries if len(entry) == 6):
+        if name != interface or int(flags, 16) & IFA_F_UNUSABLE:
+            continue
+        address = ipaddress.IPv6Address(bytes.fromhex(address_hex))
+        if not (address.is_loopback or address.is_link_local):
+            return str(address)
 
-def advertise_service(
+    return None
+
+
+async def advertise_service(
     service_name: str = "Hospitality AI - Greengrass",
     service_type: str = "_hospitality._tcp.local.",
     port: int = 8000,
     properties: Dict[str, str] = None
-) -> Zeroconf:
+) -> AsyncZeroconf:
     """
     Advertise this Greengrass server via mDNS/Bonjour.
 
+    Runs on the caller's event loop, so it can share a loop with other asyncio
+    services (e.g. a colocated FastAPI app) instead of starting its own threads.
+
     Args:
         service_name: Friendly name shown to users
         service_type: mDNS service type (must end with .local.)
         port: API server port
-        properties: Additional service metadata
+        properties: TXT record metadata (keep small: one UDP packet per RFC 6762 §6.1)
 
     Returns:
-        Zeroconf: zeroconf instance (keep alive to maintain advertisement)
+        AsyncZeroconf: zeroconf instance (keep alive to maintain advertisement)
     """
     if properties is None:
-        properties = {
-            'version': '1.0.0',
-            'api': 'v1',
-            'manufacturer': 'Hospitality AI SDK',
-            'model': 'Greengrass Core v2',
-        }
-
-    # Get local IP address
-    local_ip = get_local_ip()
+        properties = {'v': '1', 'api': 'v1'}
+
+    # Resolve local addresses once (IPv6 lets dual-stack staff devices skip IPv4 fallback)
+    interface, local_ip = get_local_interface()
+    local_ipv6 = get_local_ipv6(interface)
     logger.info(f"Local IP address: {local_ip}")
+    logger.info(f"Local IPv6 address: {local_ipv6 or 'none'}")
 
-    # Convert IP to bytes (required by zeroconf)
-    ip_parts = [int(part) for part in local_ip.split('.')]
-    ip_bytes = bytes(ip_parts)
+    # Convert IPs to packed bytes (required by zeroconf)
+    addresses = [socket.inet_pton(socket.AF_INET, local_ip)]
+    if local_ipv6:
+        addresses.append(socket.inet_pton(socket.AF_INET6, local_ipv6))
 
     # Create service info
-    service_info = ServiceInfo(
+    service_info = AsyncServiceInfo(
         type_=service_type,
         name=f"{service_name}.{service_type}",
-        addresses=[ip_bytes],
+        addresses=addresses,
         port=port,
         properties=properties,
         server="greengrass.local.",  # This is the hostname!
     )
 
     # Start zeroconf
-    zeroconf = Zeroconf()
+    aiozc = AsyncZeroconf(ip_version=IPVersion.All if local_ipv6 else IPVersion.V4Only)
 
     try:
         logger.info(f"Advertising mDNS service: {service_name}")
         logger.info(f"  Type: {service_type}")
         logger.info(f"  Hostname: greengrass.local")
         logger.info(f"  IP: {local_ip}")
+        if local_ipv6:
+            logger.info(f"  IPv6: {local_ipv6}")
         logger.info(f"  Port: {port}")
         logger.info(f"  Properties: {properties}")
 
-        zeroconf.register_service(service_info)
+        registration = await aiozc.async_register_service(service_info)
+        await registration  # Wait until the announcements have been sent
 
         logger.info("mDNS service successfully advertised!")
         logger.info("Staff devices can now discover this server as 'greengrass.local'")
 
-        return zeroconf
+        return aiozc
 
     except Exception as e:
         logger.error(f"Failed to advertise mDNS service: {e}")
-        zeroconf.close()
+        await aiozc.async_close()
         raise
 
 
-def main():
+async def main_async():
     """
-    Main entry point for the mDNS advertiser service.
+    Async entry point for the mDNS advertiser service.
 
     Runs continuously, advertising the Greengrass server on the local network.
     """
     logger.info("Starting mDNS advertiser for Greengrass...")
 
-    # Service properties (metadata shown to clients)
+    # Minimal TXT record so mDNS responses fit in a single UDP packet.
+    # Endpoints and other metadata are served by GET /services on svc_port
+    # (the sentiment service until the API gateway on 8000 is deployed).
     properties = {
-        'version': '1.0.0',
+        'v': '1',
         'api': 'v1',
-        'endpoints': 'sentiment,vision,speech,allocation,forecast',
-        'manufacturer': 'Hospitality AI SDK',
-        'model': 'AWS IoT Greengrass Core v2',
-        'security': 'network-isolated',  # Only works on property network
+        'svc_port': os.getenv("SERVICES_PORT", "8001"),
     }
 
+    # Stop on SIGTERM (Greengrass stopping the component) or SIGINT (Ctrl+C).
+    # Installed before registering so a stop during the announcements still
+    # unregisters cleanly instead of killing the process.
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+
     try:
         # Start advertising
-        zeroconf = advertise_service(
+        aiozc = await advertise_service(
             service_name="Hospitality AI - Greengrass",
             service_type="_hospitality._tcp.local.",
             port=8000,
             properties=properties
         )
 
-        # Keep service alive
+        # Block until stopped. Waiting on an Event avoids periodic wakeups,
+        # letting idle edge CPUs sleep.
         logger.info("mDNS advertiser running. Press Ctrl+C to stop.")
+        await stop.wait()
 
-        # Run forever (until Greengrass stops the component)
-        while True:
-            time.sleep(10)
-
-            # Periodic heartbeat log
-            logger.debug("mDNS service still advertising...")
-
-    except KeyboardInterrupt:
         logger.info("Received shutdown signal, stopping mDNS advertiser...")
-        zeroconf.unregister_all_services()
-        zeroconf.close()
+        await aiozc.async_unregister_all_services()
+        await aiozc.async_close()
         logger.info("mDNS advertiser stopped.")
 
     except Exception as e:
@@ -162,5 +266,10 @@ def main():
         raise
 
 
+def main():
+    """Main entry point for the mDNS advertiser service."""
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()
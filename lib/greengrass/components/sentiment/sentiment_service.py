@@ -15,16 +15,24 @@ Cost target: Near-$0 marginal cost (after initial hardware)
 """
 
 import os
+import sys
+import asyncio
 import logging
+import platform
+import shutil
+import threading
 import time
-from typing import Dict, List, Optional
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, List, Optional, Set, Tuple
 
+import numpy as np
+import onnxruntime as ort
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from transformers import pipeline
+from pydantic import BaseModel, Field, StringConstraints
+from transformers import AutoConfig, AutoTokenizer
 import uvicorn
 
 # Configure logging
@@ -36,9 +44,41 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Configuration from environment (set by Greengrass recipe)
-MODEL_NAME = os.getenv("MODEL_NAME", "distilbert-base-uncased-finetuned-sst-2-english")
+# 4-layer distilled BERT (SST-2): ~4x smaller and ~3x faster than DistilBERT once INT8
+MODEL_NAME = os.getenv("MODEL_NAME", "philschmid/tiny-bert-sst2-distilled")
+# Pre-quantized model bundle shipped as a Greengrass artifact, one subdirectory per
+# quantization target (e.g. MODEL_PATH/avx2/); skips on-device export when it matches
+MODEL_PATH = os.getenv("MODEL_PATH", "")
 PORT = int(os.getenv("PORT", "8001"))
-WORKERS = int(os.getenv("WORKERS", "2"))
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "/greengrass/v2/work/com.hospitality.sentiment/onnx")
+# OpenVINO EP device on Intel edge hardware (used only if onnxruntime-openvino is installed)
+USE_OPENVINO = os.getenv("USE_OPENVINO", "0").lower() in ("1", "true", "yes")
+OPENVINO_DEVICE = os.getenv("OPENVINO_DEVICE", "CPU_FP32")
+# Cores reserved for inference (e.g. "0-3"), leaving the rest to other Greengrass components
+GG_CPU_SET = os.getenv("GG_CPU_SET", "")
+MAX_SEQ_LENGTH = 128
+# Chat messages and staff feedback are short: truncating them to 64 tokens
+# roughly halves attention cost without losing content
+SHORT_SEQ_LENGTH = 64
+SHORT_CONTEXTS = {"chat", "staff_feedback"}
+
+# Served by GET /services (kept out of the mDNS TXT record)
+SERVICE_ENDPOINTS = ["sentiment", "vision", "speech", "allocation", "forecast"]
+MAX_BATCH_TEXTS = 100  # Largest /analyze/batch request
+
+# ISO 8601 timestamp format (UTC, microseconds appended separately)
+_DATE_FMT = "%Y-%m-%dT%H:%M:%S"
+
+# Dynamic micro-batching of concurrent /analyze requests
+MAX_BATCH = int(os.getenv("MAX_BATCH", "16"))
+MAX_WAIT_MS = int(os.getenv("MAX_WAIT_MS", "5"))
+
+# LRU cache of results for repeated inputs (canned chat messages, review templates)
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "4096"))
+
+# File names produced by the export step (fusion pass / ORTQuantizer)
+OPTIMIZED_MODEL_FILE = "model_optimized.onnx"
+QUANTIZED_MODEL_FILE = "model_optimized_quantized.onnx"
 
 # Initialize FastAPI
 app = FastAPI(
@@ -46,7 +86,8 @@ app = FastAPI(
     description="On-premise sentiment analysis for guest reviews and staff feedback",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # orjson serializes floats/dicts in C
 )
 
 # Add CORS middleware (allow property network access)
@@ -59,22 +100,101 @@ app.add_middleware(
 )
 
 # Global variables
-classifier = None
-start_time = datetime.now()
-request_count = 0
-total_latency_ms = 0
+tokenizer = None
+session = None
+session_input_names: List[str] = []
+session_output_name = ""
+# Pre-allocated flat int64 input buffers (one per session input), reused by every inference
+input_buffers: Dict[str, np.ndarray] = {}
+id2label: Dict[int, str] = {}
+inference_queue: Optional[asyncio.Queue] = None
+batch_worker_task: Optional[asyncio.Task] = None
+start_time = time.monotonic()
+
+# Single inference thread: keeps blocking session.run off the event loop and
+# serializes calls so they don't oversubscribe ORT's own intra-op thread pool
+INFERENCE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+
+
+class MetricsCounter:
+    """Request/latency counters shared by all endpoints (safe across threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._latency_ms = 0
+
+    def record(self, requests: int, latency_ms: int) -> None:
+        """Add completed requests and their total latency"""
+        with self._lock:
+            self._requests += requests
+            self._latency_ms += latency_ms
+
+    def snapshot(self) -> Tuple[int, int]:
+        """Return a consistent (requests, total_latency_ms) pair"""
+        with self._lock:
+            return self._requests, self._latency_ms
+
+
+metrics = MetricsCounter()
+
+
+class ResultCache:
+    """Bounded LRU cache of (text, max_length) → (label, score), with hit/miss counts"""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Tuple[str, int]) -> Optional[Tuple[str, float]]:
+        """Return the cached result for key, or None on a miss"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: Tuple[str, int], result: Tuple[str, float]) -> None:
+        """Store a result, evicting the least recently used entry when full"""
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return self._hits / lookups if lookups > 0 else 0.0
+
+
+result_cache = ResultCache(RESULT_CACHE_SIZE)
 
 
 # Pydantic models
+
+# Input text: surrounding whitespace stripped, blank rejected (validated in pydantic-core)
+SentimentText = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=5000)]
+
+
 class SentimentRequest(BaseModel):
     """Single sentiment analysis request"""
-    text: str = Field(..., description="Text to analyze", min_length=1, max_length=5000)
-    context: Optional[str] = Field(None, description="Context (e.g., 'guest_review', 'staff_feedback')")
+    text: SentimentText = Field(..., description="Text to analyze")
+    context: Optional[str] = Field(None, description="Context (e.g., 'guest_review', 'staff_feedback', 'chat')")
 
 
 class BatchSentimentRequest(BaseModel):
     """Batch sentiment analysis request"""
-    texts: List[str] = Field(..., description="List of texts to analyze", min_items=1, max_items=100)
+    texts: List[SentimentText] = Field(..., description="List of texts to analyze", min_items=1, max_items=MAX_BATCH_TEXTS)
 
 
 class SentimentResponse(BaseModel):
@@ -98,34 +218,378 @@ class HealthResponse(BaseModel):
     avg_latency_ms: float
 
 
+def iso_timestamp() -> str:
+    """
+    Current UTC time as ISO 8601 (e.g. "2025-10-23T20:16:30.123456Z").
+
+    Formats straight from time_ns() so responses don't build datetime objects.
+    """
+    ns = time.time_ns()
+    return f"{time.strftime(_DATE_FMT, time.gmtime(ns // 1_000_000_000))}.{ns % 1_000_000_000 // 1000:06d}Z"
+
+
+def detect_quantization_target() -> str:
+    """
+    Pick the INT8 kernel set supported by this CPU.
+
+    Returns:
+        str: AutoQuantizationConfig preset ("avx512_vnni", "avx512", "avx2" or "arm64")
+    """
+    if platform.machine().lower() in ("aarch64", "arm64"):
+        return "arm64"
+
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = next((line.split(":", 1)[1].split() for line in f if line.startswith("flags")), [])
+    except OSError:
+        flags = []
+
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags and "avx512bw" in flags:
+        return "avx512"
+    # Older edge hardware (Atom/Celeron NUCs) only has AVX2
+    return "avx2"
+
+
+def export_quantized_model(
+    model_name: str = MODEL_NAME,
+    cache_root: str = MODEL_CACHE_DIR,
+    target: Optional[str] = None
+) -> str:
+    """
+    Convert the HuggingFace model to an optimized INT8 ONNX model (runs once per device).
+
+    Export → transformer graph fusions (Attention, SkipLayerNormalization,
+    BiasGelu) → INT8 dynamic quantization. The artifact is cached so
+    subsequent component starts only reload it.
+
+    Args:
+        target: Quantization preset; defaults to this CPU's (build machines pass
+            each target to produce the artifact bundle)
+
+    Returns:
+        str: Directory (cache_root/<model>/<target>) containing the quantized model,
+            config and tokenizer
+    """
+    target = target or detect_quantization_target()
+    cache_dir = os.path.join(cache_root, model_name.replace("/", "--"), target)
+
+    if os.path.exists(os.path.join(cache_dir, QUANTIZED_MODEL_FILE)):
+        logger.info(f"Using cached INT8 ONNX model: {cache_dir}")
+        return cache_dir
+
+    # Export toolchain (optimum pulls in torch) is imported here so the serving
+    # process only needs onnxruntime, tokenizers and numpy
+    from onnxruntime.transformers import optimizer as transformers_optimizer
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    logger.info(f"Exporting {model_name} to ONNX (INT8, {target})...")
+    start = time.time()
+
+    fp32_dir = os.path.join(cache_dir, "fp32")
+    fp32_model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    fp32_model.save_pretrained(fp32_dir)
+    fp32_model.config.save_pretrained(cache_dir)
+
+    # Fuse BERT subgraphs into single contrib ops (num_heads/hidden_size detected from
+    # the graph). opt_level=1 keeps the saved graph portable across CPUs; hardware-specific
+    # layout optimizations are applied by the serving session (ORT_ENABLE_ALL).
+    fused_model = transformers_optimizer.optimize_model(
+        os.path.join(fp32_dir, "model.onnx"),
+        model_type="bert",
+        num_heads=0,
+        hidden_size=0,
+        opt_level=1,
+        use_gpu=False
+    )
+    logger.info(f"Fused operators: {fused_model.get_fused_operator_statistics()}")
+    fused_model.save_model_to_file(os.path.join(cache_dir, OPTIMIZED_MODEL_FILE))
+    shutil.rmtree(fp32_dir, ignore_errors=True)
+
+    quantizer = ORTQuantizer.from_pretrained(cache_dir, file_name=OPTIMIZED_MODEL_FILE)
+    quantizer.quantize(
+        save_dir=cache_dir,
+        quantization_config=getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=True)
+    )
+
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(cache_dir)
+
+    export_time = int((time.time() - start) * 1000)
+    logger.info(f"INT8 ONNX model exported in {export_time}ms: {cache_dir}")
+    return cache_dir
+
+
+def parse_cpu_set(spec: str) -> Set[int]:
+    """Parse a cpuset list such as "0-3,6" into CPU ids"""
+    cpus: Set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def configure_cpu_affinity() -> int:
+    """
+    Pin this process to GG_CPU_SET (if set) and size thread pools to match.
+
+    Greengrass runs several components on the same box; sizing ORT's pool to
+    every core would oversubscribe against them and thrash caches.
+
+    Returns:
+        int: Number of CPUs inference threads may use
+    """
+    if GG_CPU_SET and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, parse_cpu_set(GG_CPU_SET))
+            logger.info(f"Pinned to CPUs: {GG_CPU_SET}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to apply GG_CPU_SET={GG_CPU_SET}: {e}")
+
+    if hasattr(os, "sched_getaffinity"):
+        num_cpus = len(os.sched_getaffinity(0))
+    else:
+        num_cpus = os.cpu_count() or 1
+
+    return num_cpus
+
+
+def select_providers(num_threads: int) -> List:
+    """
+    Choose ONNX Runtime execution providers, best first.
+
+    OpenVINO EP (Intel NUC / Xeon-D) is opt-in via USE_OPENVINO: it doesn't
+    implement the com.microsoft fused ops (Attention, SkipLayerNormalization,
+    BiasGelu) in our exported model, so the graph gets split with the CPU EP.
+    Enable it only after benchmarking on the target hardware.
+    """
+    providers: List = ["CPUExecutionProvider"]
+
+    if USE_OPENVINO:
+        if "OpenVINOExecutionProvider" not in ort.get_available_providers():
+            logger.warning("USE_OPENVINO is set but onnxruntime-openvino is not installed")
+            return providers
+        providers.insert(0, (
+            "OpenVINOExecutionProvider",
+            {"device_type": OPENVINO_DEVICE, "num_of_threads": num_threads}
+        ))
+
+    return providers
+
+
+def create_session(model_path: str, num_threads: int) -> ort.InferenceSession:
+    """Create the ONNX Runtime session used for all inference requests"""
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.intra_op_num_threads = num_threads
+    sess_options.inter_op_num_threads = 1
+    sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    sess_options.enable_mem_pattern = True
+    sess_options.enable_cpu_mem_arena = True
+
+    sess = ort.InferenceSession(model_path, sess_options, providers=select_providers(num_threads))
+    # Registration order only; ORT may still assign individual nodes to the CPU EP
+    logger.info(f"ONNX Runtime execution providers (priority order): {sess.get_providers()}")
+    return sess
+
+
+def resolve_model_dir() -> str:
+    """
+    Locate the INT8 ONNX model to serve.
+
+    Uses the artifact bundle (MODEL_PATH/<target>/) only if it contains a model
+    quantized for this CPU's target: presets differ in weight format (e.g.
+    avx512_vnni uses U8S8, avx2 uses U8U8 to avoid saturation), so a model built
+    for another target is not safe to run. Otherwise exports MODEL_NAME on the device.
+    """
+    target = detect_quantization_target()
+
+    if MODEL_PATH:
+        artifact_dir = os.path.join(MODEL_PATH, target)
+        if os.path.exists(os.path.join(artifact_dir, QUANTIZED_MODEL_FILE)):
+            logger.info(f"Using INT8 ONNX model artifact ({target}): {artifact_dir}")
+            return artifact_dir
+        logger.warning(f"Model artifact has no {target} build in {MODEL_PATH}, exporting {MODEL_NAME} instead")
+
+    return export_quantized_model(target=target)
+
+
+def classify_batch(texts: List[str], max_length: int = MAX_SEQ_LENGTH) -> List[Tuple[str, float]]:
+    """
+    Run sentiment inference on a list of texts, truncated to max_length tokens.
+
+    Fused path (no transformers pipeline): tokenize → session.run → softmax → argmax.
+
+    Returns:
+        List of (label, score) tuples, in input order
+    """
+    enc = tokenizer(
+        texts,
+        truncation=True,
+        max_length=max_length,
+        padding=True,
+        return_tensors="np"
+    )
+    batch_size, seq_len = enc["input_ids"].shape
+
+    # Copy token ids into contiguous views of the pre-allocated buffers and bind
+    # them directly, so ORT reads our memory instead of fresh per-call arrays.
+    # Only the single INFERENCE_POOL thread runs this, so the buffers are not shared.
+    binding = session.io_binding()
+    for name in session_input_names:
+        view = input_buffers[name][:batch_size * seq_len].reshape(batch_size, seq_len)
+        np.copyto(view, enc[name])
+        binding.bind_cpu_input(name, view)
+    binding.bind_output(session_output_name)
+
+    session.run_with_iobinding(binding)
+    logits = binding.copy_outputs_to_cpu()[0]
+
+    # Numerically stable softmax
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    probs = exp / exp.sum(axis=-1, keepdims=True)
+    best = probs.argmax(axis=-1)
+
+    return [(id2label[int(i)], float(probs[row, i])) for row, i in enumerate(best)]
+
+
+def warm_up_session() -> None:
+    """
+    Run the session once per representative input shape.
+
+    ORT allocates arenas and plans memory lazily for each new shape, so without
+    this the first production request at a new sequence length or batch size
+    pays that setup cost (seen as "slow inference" warnings after a restart).
+    """
+    shapes = [(1, seq_len) for seq_len in (16, 32, SHORT_SEQ_LENGTH, MAX_SEQ_LENGTH)]
+    shapes += [(batch_size, MAX_SEQ_LENGTH) for batch_size in (4, 8, MAX_BATCH)]
+
+    for shape in shapes:
+        feeds = {
+            name: np.ones(shape, dtype=np.int64) if name in ("input_ids", "attention_mask")
+            else np.zeros(shape, dtype=np.int64)
+            for name in session_input_names
+        }
+        session.run(None, feeds)
+
+
+def classify(text: str) -> Tuple[str, float]:
+    """Run sentiment inference on a single text, returning (label, score)"""
+    return classify_batch([text])[0]
+
+
+async def batch_worker():
+    """
+    Coalesce concurrent /analyze requests into a single session.run call.
+
+    Waits for the first queued request, then collects up to MAX_BATCH requests
+    for at most MAX_WAIT_MS before running them as one padded batch per
+    max_length (so short-context texts aren't padded to the long limit).
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        batch = [await inference_queue.get()]
+        deadline = loop.time() + MAX_WAIT_MS / 1000
+
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(inference_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        groups: Dict[int, list] = {}
+        for text, max_length, future in batch:
+            groups.setdefault(max_length, []).append((text, future))
+
+        for max_length, items in groups.items():
+            try:
+                results = await loop.run_in_executor(
+                    INFERENCE_POOL, classify_batch, [text for text, _ in items], max_length
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+async def classify_batched(text: str, max_length: int = MAX_SEQ_LENGTH) -> Tuple[str, float]:
+    """Return the cached (label, score) for text, or queue it for the micro-batcher"""
+    key = (text, max_length)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached
+
+    future = asyncio.get_running_loop().create_future()
+    await inference_queue.put((text, max_length, future))
+    result = await future
+    result_cache.put(key, result)
+    return result
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize ML model on startup (runs once when Greengrass starts component)"""
-    global classifier
+    global tokenizer, session, session_input_names, session_output_name, input_buffers, id2label
+    global inference_queue, batch_worker_task
 
     logger.info(f"Loading sentiment analysis model: {MODEL_NAME}")
     start = time.time()
 
     try:
-        classifier = pipeline(
-            "sentiment-analysis",
-            model=MODEL_NAME,
-            device=-1  # CPU inference (use device=0 for GPU on Jetson)
-        )
+        model_dir = resolve_model_dir()
+        tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+        id2label = {int(k): v for k, v in AutoConfig.from_pretrained(model_dir).id2label.items()}
+        num_threads = configure_cpu_affinity()
+        session = create_session(os.path.join(model_dir, QUANTIZED_MODEL_FILE), num_threads)
+        session_input_names = [i.name for i in session.get_inputs()]
+        session_output_name = session.get_outputs()[0].name
+
+        buffer_size = max(MAX_BATCH, MAX_BATCH_TEXTS) * MAX_SEQ_LENGTH
+        input_buffers = {name: np.zeros(buffer_size, dtype=np.int64) for name in session_input_names}
 
         load_time = int((time.time() - start) * 1000)
         logger.info(f"Model loaded successfully in {load_time}ms")
 
-        # Warm-up inference (pre-compile)
+        # Warm-up inference (pre-compile) at every representative shape,
+        # then once through the full tokenize → IOBinding path
+        warm_up_session()
         warmup_text = "This is a test sentence for warming up the model."
-        _ = classifier(warmup_text)
+        _ = classify(warmup_text)
         logger.info("Model warm-up completed")
 
+        inference_queue = asyncio.Queue()
+        batch_worker_task = asyncio.create_task(batch_worker())
+        logger.info(f"Micro-batching enabled (max batch {MAX_BATCH}, max wait {MAX_WAIT_MS}ms)")
+
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the micro-batching worker and inference thread"""
+    if batch_worker_task:
+        batch_worker_task.cancel()
+    INFERENCE_POOL.shutdown(wait=False)
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -136,13 +600,12 @@ async def health_check():
     - CloudWatch alarms
     - Property IT staff monitoring
     """
-    global start_time, request_count, total_latency_ms
-
-    uptime = int((datetime.now() - start_time).total_seconds())
+    request_count, total_latency_ms = metrics.snapshot()
+    uptime = int(time.monotonic() - start_time)
     avg_latency = total_latency_ms / request_count if request_count > 0 else 0
 
     return HealthResponse(
-        status="healthy" if classifier else "unhealthy",
+        status="healthy" if session else "unhealthy",
         service="sentiment",
         model=MODEL_NAME,
         uptime_seconds=uptime,
@@ -186,33 +649,31 @@ async def analyze_sentiment(request: SentimentRequest):
     }
     ```
     """
-    global request_count, total_latency_ms
-
-    if not classifier:
+    if not session:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     try:
         # Run inference
-        start = time.time()
-        result = classifier(request.text)[0]
-        latency_ms = int((time.time() - start) * 1000)
+        start = time.perf_counter_ns()
+        max_length = SHORT_SEQ_LENGTH if request.context in SHORT_CONTEXTS else MAX_SEQ_LENGTH
+        label, score = await classify_batched(request.text, max_length)
+        latency_ms = (time.perf_counter_ns() - start) // 1_000_000
 
         # Update metrics
-        request_count += 1
-        total_latency_ms += latency_ms
+        metrics.record(1, latency_ms)
 
         # Log slow requests
         if latency_ms > 100:
             logger.warning(f"Slow inference: {latency_ms}ms for text length {len(request.text)}")
 
         return SentimentResponse(
-            sentiment=result["label"].lower(),
-            score=result["score"],
-            label=result["label"],
+            sentiment=label.lower(),
+            score=score,
+            label=label,
             source="greengrass-edge",
             latency_ms=latency_ms,
             context=request.context,
-            timestamp=datetime.now().isoformat()
+            timestamp=iso_timestamp()
         )
 
     except Exception as e:
@@ -246,56 +707,60 @@ async def analyze_batch(request: BatchSentimentRequest):
     }
     ```
 
-    Example response:
+    Example response (columnar: index i of each array belongs to texts[i]):
     ```json
     {
-        "results": [
-            {"text": "...", "sentiment": "positive", "score": 0.99, "latency_ms": 15},
-            {"text": "...", "sentiment": "negative", "score": 0.98, "latency_ms": 12},
-            {"text": "...", "sentiment": "neutral", "score": 0.65, "latency_ms": 14}
-        ],
+        "texts": ["The room was wonderful!", "Service was terrible.", "Average experience."],
+        "labels": ["POSITIVE", "NEGATIVE", "POSITIVE"],
+        "sentiments": ["positive", "negative", "positive"],
+        "scores": [0.99, 0.98, 0.65],
         "source": "greengrass-edge",
-        "total_latency_ms": 85,
         "count": 3,
+        "total_latency_ms": 85,
         "timestamp": "2025-10-23T20:16:30.123Z"
     }
     ```
     """
-    global request_count, total_latency_ms
-
-    if not classifier:
+    if not session:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     try:
         # Batch inference (much faster than individual)
-        start = time.time()
-        results = classifier(request.texts)
-        total_time_ms = int((time.time() - start) * 1000)
+        start = time.perf_counter_ns()
+        # Serve repeated texts from the cache, run inference only on the misses
+        results = [result_cache.get((text, MAX_SEQ_LENGTH)) for text in request.texts]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            fresh = await asyncio.get_running_loop().run_in_executor(
+                INFERENCE_POOL, classify_batch, [request.texts[i] for i in misses]
+            )
+            for i, result in zip(misses, fresh):
+                results[i] = result
+                result_cache.put((request.texts[i], MAX_SEQ_LENGTH), result)
+        total_time_ms = (time.perf_counter_ns() - start) // 1_000_000
 
         # Update metrics
-        request_count += len(request.texts)
-        total_latency_ms += total_time_ms
+        metrics.record(len(request.texts), total_time_ms)
 
         # Calculate per-text latency
         per_text_latency = total_time_ms // len(request.texts)
 
-        logger.info(f"Batch analyzed {len(request.texts)} texts in {total_time_ms}ms ({per_text_latency}ms/text)")
+        # Log slow batches only (no per-request logging on the hot path)
+        if per_text_latency > 100:
+            logger.warning(f"Slow batch inference: {len(request.texts)} texts in {total_time_ms}ms ({per_text_latency}ms/text)")
+
+        # Columnar response: a few flat lists instead of one dict per text
+        labels = [label for label, _ in results]
 
         return {
-            "results": [
-                {
-                    "text": text,
-                    "sentiment": result["label"].lower(),
-                    "score": result["score"],
-                    "label": result["label"],
-                    "latency_ms": per_text_latency
-                }
-                for text, result in zip(request.texts, results)
-            ],
+            "texts": request.texts,
+            "labels": labels,
+            "sentiments": [label.lower() for label in labels],
+            "scores": [score for _, score in results],
             "source": "greengrass-edge",
-            "total_latency_ms": total_time_ms,
             "count": len(request.texts),
-            "timestamp": datetime.now().isoformat()
+            "total_latency_ms": total_time_ms,
+            "timestamp": iso_timestamp()
         }
 
     except Exception as e:
@@ -303,6 +768,24 @@ async def analyze_batch(request: BatchSentimentRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/services")
+async def list_services():
+    """
+    List the services offered by this Greengrass server.
+
+    Clients query this once after discovering greengrass.local via mDNS; the
+    list lives here instead of the TXT record so mDNS responses stay small.
+    """
+    return {
+        "version": "1.0.0",
+        "api": "v1",
+        "endpoints": SERVICE_ENDPOINTS,
+        "manufacturer": "Hospitality AI SDK",
+        "model": "AWS IoT Greengrass Core v2",
+        "security": "network-isolated"
+    }
+
+
 @app.get("/metrics")
 async def get_metrics():
     """
@@ -313,9 +796,8 @@ async def get_metrics():
     - Grafana dashboards
     - Property IT monitoring
     """
-    global start_time, request_count, total_latency_ms
-
-    uptime = int((datetime.now() - start_time).total_seconds())
+    request_count, total_latency_ms = metrics.snapshot()
+    uptime = int(time.monotonic() - start_time)
     avg_latency = total_latency_ms / request_count if request_count > 0 else 0
 
     return {
@@ -323,8 +805,9 @@ async def get_metrics():
         "sentiment_service_requests_total": request_count,
         "sentiment_service_latency_avg_ms": round(avg_latency, 2),
         "sentiment_service_latency_total_ms": total_latency_ms,
+        "sentiment_service_cache_hit_ratio": round(result_cache.hit_ratio(), 4),
         "sentiment_service_model": MODEL_NAME,
-        "sentiment_service_status": 1 if classifier else 0
+        "sentiment_service_status": 1 if session else 0
     }
 
 
@@ -332,12 +815,12 @@ async def get_metrics():
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unexpected errors"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "detail": str(exc),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_timestamp()
         }
     )
 
@@ -350,7 +833,8 @@ if __name__ == "__main__":
     - Greengrass will run this script via recipe.yaml
     - Listens on local network (0.0.0.0) for property access
     - Port 8001 (configurable via environment variable)
-    - Workers: 2 (configurable, increase for high-traffic properties)
+    - Single worker: ORT already uses every core, and each extra worker would
+      load another copy of the model. Scale out with more Greengrass devices.
 
     Access:
     - From PMS: http://greengrass.local:8001/analyze
@@ -358,17 +842,33 @@ if __name__ == "__main__":
     - Health check: http://greengrass.local:8001/health
     - Metrics: http://greengrass.local:8001/metrics
     - Docs: http://greengrass.local:8001/docs
+
+    Runs on uvloop with the httptools parser (C-accelerated, from uvicorn[standard]).
+    Access logging is off; slow requests are logged as warnings instead.
     """
+    if "--export-only" in sys.argv:
+        # Build the INT8 model ahead of time. Without arguments (Greengrass Install
+        # lifecycle) this resolves the model for this device; a build machine passes
+        # the quantization targets to include in the artifact bundle.
+        targets = sys.argv[sys.argv.index("--export-only") + 1:]
+        if targets:
+            for target in targets:
+                print(export_quantized_model(target=target))
+        else:
+            print(resolve_model_dir())
+        sys.exit(0)
+
     logger.info(f"Starting sentiment analysis service...")
     logger.info(f"Model: {MODEL_NAME}")
     logger.info(f"Port: {PORT}")
-    logger.info(f"Workers: {WORKERS}")
 
     uvicorn.run(
         app,
         host="0.0.0.0",  # Listen on all interfaces (property network)
         port=PORT,
-        workers=WORKERS,
+        workers=1,
+        loop="uvloop",
+        http="httptools",
         log_level=LOG_LEVEL.lower(),
-        access_log=True
+        access_log=False
     )